@@ -1,6 +1,5 @@
 from src.repository.tools.base_tool import BaseTool
 import subprocess
-import os
 import shlex
 import logging
 
@@ -41,12 +40,16 @@ class BashTool(BaseTool):
             "userdel", "useradd", "su -", "curl", "wget"
         ]
     
-    def run(self, command):
+    def run(self, command, cwd=None, argv=None, timeout=30):
         """
         Executes shell command and returns output.
         
         Args:
             command: Shell command string to execute.
+            cwd: Optional working directory; defaults to the current directory.
+            argv: Optional argument list for command; when given it is executed
+                directly without a shell. The security check still uses command.
+            timeout: Seconds before the command is stopped.
             
         Returns:
             Output from the command execution.
@@ -66,12 +69,12 @@ class BashTool(BaseTool):
             # Use shell=True for Windows compatibility, but be careful with input
             # On Windows, we need shell=True to execute commands properly
             result = subprocess.run(
-                command,
-                shell=True,
+                argv if argv is not None else command,
+                shell=argv is None,
                 capture_output=True,
                 text=True,
-                timeout=30,  # 30 second timeout
-                cwd=os.getcwd()
+                timeout=timeout,
+                cwd=cwd  # None runs in the current directory without a getcwd() lookup
             )
             
             output = {
@@ -94,7 +97,7 @@ class BashTool(BaseTool):
                 return error_msg
             
         except subprocess.TimeoutExpired:
-            error_msg = f"Command timed out after 30 seconds: {command}"
+            error_msg = f"Command timed out after {timeout} seconds: {command}"
             logger.error(f"⏰ {error_msg}")
             return error_msg
         except subprocess.CalledProcessError as e:
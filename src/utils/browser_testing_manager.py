@@ -6,16 +6,22 @@ the MCP browser-use system and AI agents for comprehensive testing.
 """
 
 import os
+import re
 import json
 import time
 import asyncio
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
 from typing import Dict, List, Any, Optional, Tuple
 from pathlib import Path
 import logging
 import requests
+from requests.adapters import HTTPAdapter
 from urllib.parse import urlparse, urljoin
 
+from src.utils.http_probe import probe_url
+
 # Import MCP browser helpers if available
 try:
     from web_ui.src.mcp_helpers.browser_helpers import run_browser_task
@@ -34,9 +40,213 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Keep-alive connections kept per host; covers the concurrent API endpoint sweep
+_HTTP_POOL_SIZE = 10
+
+# Maximum decoded bytes the connectivity check reads from a body. content_length is the decoded
+# size like len(response.content); longer bodies report their uncompressed Content-Length if
+# advertised, else this cap.
+_CONNECTIVITY_READ_CAP = 64 * 1024
+
+# Common API endpoints to test, paired with their test names
+_API_ENDPOINTS = tuple(
+    (endpoint, f"endpoint_{endpoint.replace('/', '_').strip('_')}")
+    for endpoint in (
+        "/health",
+        "/status",
+        "/api/health",
+        "/api/v1/health",
+        "/docs",
+        "/api/docs",
+        "/swagger",
+        "/openapi.json"
+    )
+)
+
+# Page responses slower than this fail the page_load_time check
+_PAGE_LOAD_BUDGET_SECONDS = 5.0
+
+# Indicators looked for in page bodies by _test_web_functionality
+_CSS_INDICATORS = frozenset({"stylesheet", ".css"})
+_JS_INDICATORS = frozenset({"script", ".js"})
+_IMAGE_INDICATORS = frozenset({"img", ".png", ".jpg"})
+_RESPONSIVE_INDICATORS = frozenset({"viewport", "media", "responsive", "mobile"})
+_PAGE_INDICATOR_PATTERN = re.compile(
+    "|".join(re.escape(indicator) for indicator in sorted(
+        _CSS_INDICATORS | _JS_INDICATORS | _IMAGE_INDICATORS | _RESPONSIVE_INDICATORS,
+        key=len,
+        reverse=True
+    )),
+    re.IGNORECASE
+)
+
+# Basic scenarios that work for most web applications
+_DEFAULT_SCENARIOS = (
+    MappingProxyType({
+        "name": "navigation_test",
+        "task": "navigate around the website, click on any navigation links or buttons you find, and report what you discover"
+    }),
+    MappingProxyType({
+        "name": "form_interaction",
+        "task": "look for any forms on the page and try to interact with them (but don't submit anything sensitive)"
+    }),
+    MappingProxyType({
+        "name": "ui_elements_check",
+        "task": "check all the UI elements on the page - buttons, links, images, and report if anything seems broken or missing"
+    }),
+    MappingProxyType({
+        "name": "responsive_test",
+        "task": "test if the website works well by resizing the browser window to different sizes"
+    })
+)
+
+_BASE_SUITE_TESTS = (
+    "verify that the main page loads correctly and all elements are visible",
+    "test all navigation links and ensure they work properly",
+    "check that all images load correctly and have appropriate alt text",
+    "verify that the page is responsive and works on different screen sizes"
+)
+
+# Extra tests appended to the base suite, keyed by application type
+_SUITE_TABLE: Dict[str, Tuple[str, ...]] = {
+    "api": (
+        "test the API documentation if available",
+        "verify that the API returns proper error codes for invalid requests",
+        "check if the API has rate limiting or authentication"
+    ),
+    "ecommerce": (
+        "test the product search functionality",
+        "verify that product pages display correctly",
+        "test the shopping cart functionality (without making purchases)",
+        "check the checkout process flow (stop before payment)"
+    ),
+    "blog": (
+        "test the blog post listing and pagination",
+        "verify that individual blog posts display correctly",
+        "test the search functionality if available",
+        "check the comment section (if enabled)"
+    ),
+    "dashboard": (
+        "test all dashboard widgets and charts",
+        "verify that data filtering works correctly",
+        "test any data export functionality",
+        "check that user settings can be accessed"
+    )
+}
+
+class _BrowserPool:
+    """Keeps launched Playwright browsers warm between test runs and closes idle ones."""
+    
+    def __init__(self, idle_ttl: float = 300.0, reap_interval: float = 60.0):
+        """
+        Initialize the browser pool.
+        
+        Args:
+            idle_ttl: Seconds a released browser may stay idle before it is closed
+            reap_interval: Seconds between idle-browser sweeps
+        """
+        self.idle_ttl = idle_ttl
+        self.reap_interval = reap_interval
+        self._idle: Dict[bool, List[Tuple[Any, float]]] = {}
+        self._playwright = None
+        self._loop = None
+        self._reaper_task = None
+    
+    def _bind_loop(self) -> None:
+        """Reset pool state when used from a different event loop than the one that launched it."""
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # Browsers and the Playwright driver belong to the loop that started them. They are
+            # closed when that loop shuts down (see _reaper); anything still here was not, and
+            # cannot be closed from this loop.
+            if self._playwright is not None:
+                logger.warning("⚠️ Browser pool: previous event loop ended without closing its browsers")
+            self._idle = {}
+            self._playwright = None
+            self._reaper_task = None
+            self._loop = loop
+    
+    async def acquire(self, headless: bool):
+        """Return a connected browser, reusing an idle one when available."""
+        self._bind_loop()
+        
+        idle = self._idle.setdefault(headless, [])
+        while idle:
+            browser, _ = idle.pop()
+            if browser.is_connected():
+                return browser
+        
+        if self._playwright is None:
+            self._playwright = await async_playwright().start()
+        if self._reaper_task is None:
+            self._reaper_task = asyncio.create_task(self._reaper())
+        
+        return await self._playwright.chromium.launch(headless=headless)
+    
+    async def release(self, browser, headless: bool) -> None:
+        """Return a browser to the pool, or close it if it can no longer be reused."""
+        if browser.is_connected() and asyncio.get_running_loop() is self._loop:
+            self._idle.setdefault(headless, []).append((browser, time.monotonic()))
+        else:
+            await self._close_browser(browser)
+    
+    async def close(self) -> None:
+        """Close every pooled browser and stop the Playwright driver."""
+        if self._reaper_task is not None:
+            # Cleared first so the reaper's cancellation handler leaves the closing to us
+            reaper_task, self._reaper_task = self._reaper_task, None
+            reaper_task.cancel()
+        
+        for idle in self._idle.values():
+            for browser, _ in idle:
+                await self._close_browser(browser)
+        self._idle = {}
+        
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+    
+    async def _reaper(self) -> None:
+        """
+        Periodically close browsers that have been idle longer than the TTL.
+        
+        asyncio.run cancels this task when its loop shuts down; the pool is closed then,
+        so each run's browsers and Playwright driver go away with the loop that owns them.
+        """
+        try:
+            while True:
+                await asyncio.sleep(self.reap_interval)
+                cutoff = time.monotonic() - self.idle_ttl
+                
+                for idle in self._idle.values():
+                    keep = []
+                    for browser, last_used in idle:
+                        if last_used < cutoff or not browser.is_connected():
+                            await self._close_browser(browser)
+                        else:
+                            keep.append((browser, last_used))
+                    idle[:] = keep
+        except asyncio.CancelledError:
+            if self._reaper_task is asyncio.current_task():
+                # Cancelled by loop shutdown rather than by close()
+                self._reaper_task = None
+                await self.close()
+            raise
+    
+    @staticmethod
+    async def _close_browser(browser) -> None:
+        """Close a browser, ignoring errors from already-dead processes."""
+        try:
+            await browser.close()
+        except Exception as e:
+            logger.debug(f"Ignoring error while closing pooled browser: {e}")
+
 class BrowserTestingManager:
     """Handles automated browser testing of web applications."""
     
+    # Warm browsers shared by every manager in the process
+    _BROWSER_POOL = _BrowserPool()
+    
     def __init__(self, use_mcp: bool = True, headless: bool = False):
         """
         Initialize the browser testing manager.
@@ -49,6 +259,12 @@ class BrowserTestingManager:
         self.headless = headless
         self.test_results = []
         self.active_sessions = {}
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=_HTTP_POOL_SIZE, pool_maxsize=_HTTP_POOL_SIZE)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        self._api_classify_cache: Dict[str, bool] = {}
+        self._pending_writes = set()
         
         if not self.use_mcp and not PLAYWRIGHT_AVAILABLE:
             raise ImportError("Neither MCP browser-use nor Playwright is available")
@@ -71,9 +287,13 @@ class BrowserTestingManager:
             Comprehensive test results
         """
         try:
+            # Drop repeated URLs while keeping the caller's order
+            service_urls = list(dict.fromkeys(service_urls))
+            
             logger.info(f"🧪 Starting browser testing for {len(service_urls)} URLs")
             
             all_results = []
+            successful_urls = 0
             
             for url in service_urls:
                 logger.info(f"🌐 Testing URL: {url}")
@@ -90,6 +310,8 @@ class BrowserTestingManager:
                     })
                     continue
                 
+                successful_urls += 1
+                
                 # UI and functionality tests
                 if self.use_mcp:
                     ui_results = self._run_mcp_ui_tests(url, test_scenarios, custom_tests)
@@ -106,8 +328,11 @@ class BrowserTestingManager:
                     "timestamp": time.strftime("%Y-%m-%d %H:%M:%S")
                 })
             
+            # Screenshots are written in the background; make sure they exist before reporting
+            await self._flush_screenshot_writes()
+            
             # Generate comprehensive report
-            test_report = self._generate_test_report(all_results)
+            test_report = self._generate_test_report(all_results, successful_urls)
             
             # Save test results
             self.test_results.append({
@@ -126,8 +351,8 @@ class BrowserTestingManager:
                 "detailed_results": all_results,
                 "summary": {
                     "total_urls": len(service_urls),
-                    "successful_tests": len([r for r in all_results if r["connectivity"]["success"]]),
-                    "failed_tests": len([r for r in all_results if not r["connectivity"]["success"]])
+                    "successful_tests": successful_urls,
+                    "failed_tests": len(all_results) - successful_urls
                 }
             }
             
@@ -140,15 +365,25 @@ class BrowserTestingManager:
         try:
             logger.info(f"🔗 Testing connectivity to {url}")
             
-            response = requests.get(url, timeout=10)
-            
-            return {
-                "success": True,
-                "status_code": response.status_code,
-                "response_time": response.elapsed.total_seconds(),
-                "content_length": len(response.content),
-                "content_type": response.headers.get("content-type", "unknown")
-            }
+            with self._session.get(url, timeout=10, stream=True) as response:
+                # Measure the decoded body, reading one byte past the cap to tell whether it was cut short
+                content_length = len(response.raw.read(_CONNECTIVITY_READ_CAP + 1, decode_content=True))
+                if content_length > _CONNECTIVITY_READ_CAP:
+                    # Without a content coding the advertised length is the decoded length
+                    declared_length = response.headers.get("content-length", "")
+                    is_identity = response.headers.get("content-encoding", "identity").lower() == "identity"
+                    if declared_length.isdigit() and is_identity:
+                        content_length = int(declared_length)
+                    else:
+                        content_length = _CONNECTIVITY_READ_CAP
+                
+                return {
+                    "success": True,
+                    "status_code": response.status_code,
+                    "response_time": response.elapsed.total_seconds(),
+                    "content_length": content_length,
+                    "content_type": response.headers.get("content-type", "unknown")
+                }
             
         except Exception as e:
             logger.error(f"Connectivity test failed for {url}: {str(e)}")
@@ -168,6 +403,9 @@ class BrowserTestingManager:
             if not test_scenarios and not custom_tests:
                 test_scenarios = self._get_default_test_scenarios(url)
             
+            # run_browser_task only launches the agent process and returns its task ID, so these
+            # calls never wait on the agents; they stay sequential because the helper keeps its
+            # task state in module globals
             results = []
             
             # Run default scenarios
@@ -258,23 +496,28 @@ class BrowserTestingManager:
             if not PLAYWRIGHT_AVAILABLE:
                 return {"success": False, "error": "Playwright not available"}
             
-            async with async_playwright() as p:
-                browser = await p.chromium.launch(headless=self.headless)
+            browser = await self._BROWSER_POOL.acquire(self.headless)
+            try:
                 context = await browser.new_context()
                 page = await context.new_page()
                 
                 results = []
                 
+                # Listen before navigating so errors raised during load are captured too
+                console_errors = []
+                page.on("console", lambda msg: console_errors.append(msg.text) if msg.type == "error" else None)
+                
                 try:
                     # Navigate to the URL
                     await page.goto(url, wait_until="networkidle")
                     
                     # Take screenshot
                     screenshot_path = f"screenshot_{int(time.time())}.png"
-                    await page.screenshot(path=screenshot_path)
+                    screenshot = await page.screenshot(type="png")
+                    self._write_screenshot(screenshot_path, screenshot)
                     
                     # Basic UI tests
-                    basic_tests = await self._run_basic_playwright_tests(page)
+                    basic_tests = await self._run_basic_playwright_tests(page, console_errors)
                     results.extend(basic_tests)
                     
                     # Custom scenarios if provided
@@ -292,14 +535,34 @@ class BrowserTestingManager:
                     }
                     
                 finally:
-                    await browser.close()
-                    
+                    await context.close()
+            finally:
+                await self._BROWSER_POOL.release(browser, self.headless)
+                
         except Exception as e:
             logger.error(f"Playwright UI tests failed: {str(e)}")
             return {"success": False, "error": str(e)}
     
-    async def _run_basic_playwright_tests(self, page) -> List[Dict[str, Any]]:
-        """Run basic Playwright tests on a page."""
+    def _write_screenshot(self, path: str, data: bytes) -> None:
+        """Write screenshot bytes in a worker thread so browser work can continue meanwhile."""
+        task = asyncio.create_task(asyncio.to_thread(Path(path).write_bytes, data))
+        self._pending_writes.add(task)
+        task.add_done_callback(self._pending_writes.discard)
+    
+    async def _flush_screenshot_writes(self) -> None:
+        """Wait for all in-flight screenshot writes to reach disk."""
+        if self._pending_writes:
+            results = await asyncio.gather(*self._pending_writes, return_exceptions=True)
+            for result in results:
+                if isinstance(result, Exception):
+                    logger.warning(f"Failed to write screenshot: {result}")
+    
+    async def _run_basic_playwright_tests(
+        self, 
+        page, 
+        console_errors: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """Run basic Playwright tests on a page, using console errors collected since navigation."""
         tests = []
         
         try:
@@ -328,12 +591,9 @@ class BrowserTestingManager:
                     "result": f"Found {description}" if element else f"No {description} found"
                 })
             
-            # Test for console errors
-            console_errors = []
-            page.on("console", lambda msg: console_errors.append(msg.text) if msg.type == "error" else None)
-            
-            # Wait a bit to collect console messages
-            await page.wait_for_timeout(2000)
+            # Test for console errors - the page already reached network idle, so
+            # messages logged during load are in the pre-attached listener's list
+            console_errors = console_errors if console_errors is not None else []
             
             tests.append({
                 "test_name": "no_console_errors",
@@ -413,80 +673,85 @@ class BrowserTestingManager:
     
     def _is_api_endpoint(self, url: str) -> bool:
         """Check if URL appears to be an API endpoint."""
+        if "api" in url.lower():
+            return True
+        
+        # Content type and API-version headers are host-level, so probe each host once
+        parsed = urlparse(url)
+        host_key = f"{parsed.scheme}://{parsed.netloc}"
+        if host_key in self._api_classify_cache:
+            return self._api_classify_cache[host_key]
+        
         try:
-            response = requests.get(url, timeout=5)
+            response = probe_url(self._session, url, timeout=5)
             content_type = response.headers.get("content-type", "").lower()
             
-            return (
+            is_api = (
                 "application/json" in content_type or
-                "api" in url.lower() or
                 response.headers.get("x-api-version") is not None
             )
         except:
             return False
+        
+        self._api_classify_cache[host_key] = is_api
+        return is_api
     
     def _test_api_endpoints(self, base_url: str) -> List[Dict[str, Any]]:
         """Test common API endpoints."""
         tests = []
         
-        # Common API endpoints to test
-        endpoints = [
-            "/health",
-            "/status", 
-            "/api/health",
-            "/api/v1/health",
-            "/docs",
-            "/api/docs",
-            "/swagger",
-            "/openapi.json"
-        ]
+        endpoint_urls = [(test_name, urljoin(base_url, endpoint)) for endpoint, test_name in _API_ENDPOINTS]
         
-        for endpoint in endpoints:
-            try:
-                url = urljoin(base_url, endpoint)
-                response = requests.get(url, timeout=5)
-                
-                tests.append({
-                    "test_name": f"endpoint_{endpoint.replace('/', '_').strip('_')}",
-                    "success": response.status_code < 400,
-                    "status_code": response.status_code,
-                    "url": url
-                })
-                
-            except Exception as e:
-                tests.append({
-                    "test_name": f"endpoint_{endpoint.replace('/', '_').strip('_')}",
-                    "success": False,
-                    "error": str(e),
-                    "url": urljoin(base_url, endpoint)
-                })
+        # Probe all endpoints at once over the pooled session; map keeps the endpoint order
+        with ThreadPoolExecutor(max_workers=len(endpoint_urls)) as executor:
+            tests.extend(executor.map(lambda endpoint: self._test_api_endpoint(*endpoint), endpoint_urls))
         
         return tests
     
+    def _test_api_endpoint(self, test_name: str, url: str) -> Dict[str, Any]:
+        """Test a single resolved API endpoint URL."""
+        try:
+            response = probe_url(self._session, url, timeout=5)
+            
+            return {
+                "test_name": test_name,
+                "success": response.status_code < 400,
+                "status_code": response.status_code,
+                "url": url
+            }
+            
+        except Exception as e:
+            return {
+                "test_name": test_name,
+                "success": False,
+                "error": str(e),
+                "url": url
+            }
+    
     def _test_web_functionality(self, url: str) -> List[Dict[str, Any]]:
         """Test common web application functionality."""
         tests = []
         
         try:
-            # Test main page load time
-            start_time = time.time()
-            response = requests.get(url, timeout=10)
-            load_time = time.time() - start_time
+            response = self._session.get(url, timeout=10)
+            
+            # Test main page load time (time until the response headers arrived)
+            load_time = response.elapsed.total_seconds()
             
             tests.append({
                 "test_name": "page_load_time",
-                "success": load_time < 5.0,  # Consider 5 seconds as acceptable
+                "success": load_time < _PAGE_LOAD_BUDGET_SECONDS,
                 "load_time": load_time,
                 "result": f"Page loaded in {load_time:.2f} seconds"
             })
             
-            # Test for common static assets
-            content = response.text.lower()
+            # Collect every asset/responsive indicator in a single pass over the body
+            found = {match.group().lower() for match in _PAGE_INDICATOR_PATTERN.finditer(response.text)}
             
             assets_tests = [
-                ("css", "stylesheet" in content or ".css" in content),
-                ("javascript", "script" in content or ".js" in content),
-                ("images", "img" in content or ".png" in content or ".jpg" in content)
+                ("css", bool(found & _CSS_INDICATORS)),
+                ("javascript", bool(found & _JS_INDICATORS)),
+                ("images", bool(found & _IMAGE_INDICATORS))
             ]
             
             for asset_type, has_asset in assets_tests:
@@ -497,14 +762,7 @@ class BrowserTestingManager:
                 })
             
             # Test for responsive design indicators
-            responsive_indicators = [
-                "viewport",
-                "media",
-                "responsive",
-                "mobile"
-            ]
-            
-            has_responsive = any(indicator in content for indicator in responsive_indicators)
+            has_responsive = bool(found & _RESPONSIVE_INDICATORS)
             tests.append({
                 "test_name": "responsive_design",
                 "success": has_responsive,
@@ -522,66 +780,75 @@ class BrowserTestingManager:
     
     def _get_default_test_scenarios(self, url: str) -> List[Dict[str, Any]]:
         """Get default test scenarios based on the application type."""
+        return [dict(scenario) for scenario in _DEFAULT_SCENARIOS]
+    
+    def _generate_test_report(
+        self, 
+        results: List[Dict[str, Any]], 
+        successful_urls: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Generate a comprehensive test report.
         
-        # Basic scenarios that work for most web applications
-        scenarios = [
-            {
-                "name": "navigation_test",
-                "task": "navigate around the website, click on any navigation links or buttons you find, and report what you discover"
-            },
-            {
-                "name": "form_interaction",
-                "task": "look for any forms on the page and try to interact with them (but don't submit anything sensitive)"
-            },
-            {
-                "name": "ui_elements_check", 
-                "task": "check all the UI elements on the page - buttons, links, images, and report if anything seems broken or missing"
-            },
-            {
-                "name": "responsive_test",
-                "task": "test if the website works well by resizing the browser window to different sizes"
-            }
-        ]
+        Args:
+            results: Per-URL results from test_application
+            successful_urls: Number of reachable URLs if the caller already counted them
+            
+        Returns:
+            Report with summary, per-URL details and recommendations
+        """
+        detailed_results = []
+        recommendations = []
+        counted_successes = 0
+        
+        for result in results:
+            connectivity = result["connectivity"]
+            ui_tests = result["ui_tests"]
+            functionality_tests = result["functionality_tests"]
+            accessible = connectivity["success"]
+            
+            detailed_results.append({
+                "url": result["url"],
+                "accessible": accessible,
+                "response_time": connectivity.get("response_time"),
+                "ui_tests_passed": ui_tests.get("passed_tests", 0),
+                "ui_tests_total": ui_tests.get("total_tests", 0),
+                "functionality_tests_passed": functionality_tests.get("passed_tests", 0),
+                "functionality_tests_total": functionality_tests.get("total_tests", 0)
+            })
+            
+            # Generate recommendations
+            if accessible:
+                counted_successes += 1
+            else:
+                recommendations.append(f"Fix connectivity issues for {result['url']}")
+            
+            if ui_tests.get("passed_tests", 0) < ui_tests.get("total_tests", 1):
+                recommendations.append(f"Investigate UI issues for {result['url']}")
         
-        return scenarios
-    
-    def _generate_test_report(self, results: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Generate a comprehensive test report."""
         total_urls = len(results)
-        successful_urls = len([r for r in results if r["connectivity"]["success"]])
+        if successful_urls is None:
+            successful_urls = counted_successes
         
-        report = {
+        return {
             "summary": {
                 "total_urls_tested": total_urls,
                 "successful_connections": successful_urls,
                 "failed_connections": total_urls - successful_urls,
                 "overall_success_rate": (successful_urls / total_urls * 100) if total_urls > 0 else 0
             },
-            "detailed_results": [],
-            "recommendations": []
+            "detailed_results": detailed_results,
+            "recommendations": recommendations
         }
-        
-        for result in results:
-            url_report = {
-                "url": result["url"],
-                "accessible": result["connectivity"]["success"],
-                "response_time": result["connectivity"].get("response_time"),
-                "ui_tests_passed": result["ui_tests"].get("passed_tests", 0),
-                "ui_tests_total": result["ui_tests"].get("total_tests", 0),
-                "functionality_tests_passed": result["functionality_tests"].get("passed_tests", 0),
-                "functionality_tests_total": result["functionality_tests"].get("total_tests", 0)
-            }
-            
-            report["detailed_results"].append(url_report)
-            
-            # Generate recommendations
-            if not result["connectivity"]["success"]:
-                report["recommendations"].append(f"Fix connectivity issues for {result['url']}")
-            
-            if result["ui_tests"].get("passed_tests", 0) < result["ui_tests"].get("total_tests", 1):
-                report["recommendations"].append(f"Investigate UI issues for {result['url']}")
-        
-        return report
+    
+    def close(self) -> None:
+        """Release pooled HTTP connections held by this manager."""
+        self._session.close()
+    
+    @classmethod
+    async def close_browser_pool(cls) -> None:
+        """Close all warm Playwright browsers held by the shared pool."""
+        await cls._BROWSER_POOL.close()
     
     def get_test_history(self) -> List[Dict[str, Any]]:
         """Get the history of all test runs."""
@@ -589,51 +856,7 @@ class BrowserTestingManager:
     
     def generate_comprehensive_test_suite(self, url: str, app_type: str = "web") -> List[str]:
         """Generate a comprehensive test suite based on application type."""
-        
-        base_tests = [
-            "verify that the main page loads correctly and all elements are visible",
-            "test all navigation links and ensure they work properly",
-            "check that all images load correctly and have appropriate alt text",
-            "verify that the page is responsive and works on different screen sizes"
-        ]
-        
-        if app_type == "api":
-            api_tests = [
-                "test the API documentation if available",
-                "verify that the API returns proper error codes for invalid requests",
-                "check if the API has rate limiting or authentication"
-            ]
-            return base_tests + api_tests
-        
-        elif app_type == "ecommerce":
-            ecommerce_tests = [
-                "test the product search functionality",
-                "verify that product pages display correctly",
-                "test the shopping cart functionality (without making purchases)",
-                "check the checkout process flow (stop before payment)"
-            ]
-            return base_tests + ecommerce_tests
-        
-        elif app_type == "blog":
-            blog_tests = [
-                "test the blog post listing and pagination",
-                "verify that individual blog posts display correctly",
-                "test the search functionality if available",
-                "check the comment section (if enabled)"
-            ]
-            return base_tests + blog_tests
-        
-        elif app_type == "dashboard":
-            dashboard_tests = [
-                "test all dashboard widgets and charts",
-                "verify that data filtering works correctly",
-                "test any data export functionality",
-                "check that user settings can be accessed"
-            ]
-            return base_tests + dashboard_tests
-        
-        else:
-            return base_tests
+        return list(_BASE_SUITE_TESTS + _SUITE_TABLE.get(app_type, ()))
 
     async def run_comprehensive_tests(
         self, 
@@ -673,7 +896,9 @@ def test_application_quick(service_urls: List[str], headless: bool = True) -> Di
 async def test_with_playwright(url: str, headless: bool = True) -> Dict[str, Any]:
     """Test application using Playwright directly."""
     manager = BrowserTestingManager(use_mcp=False, headless=headless)
-    return await manager._run_playwright_ui_tests(url)
+    result = await manager._run_playwright_ui_tests(url)
+    await manager._flush_screenshot_writes()
+    return result
 
 if __name__ == "__main__":
     # Test the browser testing manager
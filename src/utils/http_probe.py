@@ -0,0 +1,18 @@
+"""
+HTTP Probing Helpers for Automated Workflow System
+
+This module holds the lightweight HTTP checks shared by the deployment and
+browser testing managers.
+"""
+
+import requests
+
+
+def probe_url(session: requests.Session, url: str, timeout: float = 5) -> requests.Response:
+    """Fetch status and headers only, falling back to a streamed GET if HEAD is refused."""
+    response = session.head(url, timeout=timeout, allow_redirects=True)
+    if response.status_code in (405, 501):
+        # Body is never read; closing releases the connection back to the pool
+        response = session.get(url, timeout=timeout, stream=True)
+        response.close()
+    return response
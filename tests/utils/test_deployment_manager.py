@@ -0,0 +1,250 @@
+"""
+Tests for DeploymentManager state persistence, batch deployment, history and caches.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add the repository root to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.repository.tools.bash_tool import BashTool
+from src.utils.deployment_manager import (
+    DeploymentManager,
+    _MAX_DEPLOYMENT_HISTORY,
+    _is_process_group_alive,
+    _process_create_time,
+)
+
+
+class RecordingBashTool(BashTool):
+    """BashTool that records commands instead of running them."""
+
+    def __init__(self):
+        super().__init__()
+        self.commands = []
+
+    def run(self, command, cwd=None, argv=None, timeout=30):
+        self.commands.append(command)
+        return "Command completed with no output"
+
+
+@pytest.fixture
+def sleeper():
+    """A live process that stands in for a deployed service."""
+    process = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(60)"])
+    yield process
+    process.kill()
+    process.wait()
+
+
+def _touch(path: Path, content: str) -> None:
+    """Rewrite a file and move its mtime forward so coarse timestamps still differ."""
+    path.write_text(content)
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def _register(manager: DeploymentManager, deployment_id: str, process: subprocess.Popen) -> None:
+    manager.active_deployments[deployment_id] = {
+        "project_path": "/tmp/project",
+        "project_type": "nodejs",
+        "process_id": process.pid,
+        "process_create_time": _process_create_time(process.pid),
+        "service_urls": ["http://localhost:3000"],
+        "started_at_ns": time.time_ns(),
+        "config": manager._get_deployment_config("nodejs")
+    }
+
+
+# ── State persistence ──────────────────────────────────────────────────────
+
+def test_state_round_trip_restores_live_deployments(tmp_path, sleeper):
+    state_path = tmp_path / "state.json"
+    project = tmp_path / "project"
+    project.mkdir()
+    (project / "package.json").write_text("{}")
+
+    manager = DeploymentManager(state_path=str(state_path))
+    _register(manager, "project_1", sleeper)
+    assert manager._detect_project_type(project) == "nodejs"
+    manager._save_state()
+
+    restored = DeploymentManager(state_path=str(state_path))
+    assert list(restored.active_deployments) == ["project_1"]
+    deployment = restored.active_deployments["project_1"]
+    assert deployment["process_id"] == sleeper.pid
+    assert deployment["config"] == manager._get_deployment_config("nodejs")
+    assert restored._project_type_cache[str(project)][1] == "nodejs"
+
+
+def test_state_restore_skips_pid_with_different_create_time(tmp_path, sleeper):
+    state_path = tmp_path / "state.json"
+    manager = DeploymentManager(state_path=str(state_path))
+    _register(manager, "project_1", sleeper)
+    manager._save_state()
+
+    # Same PID, different start time: the PID was reused by an unrelated process
+    state = json.loads(state_path.read_text())
+    state["active_deployments"]["project_1"]["process_create_time"] -= 10
+    state_path.write_text(json.dumps(state))
+
+    assert DeploymentManager(state_path=str(state_path)).active_deployments == {}
+
+
+def test_state_restore_skips_records_without_create_time(tmp_path, sleeper):
+    state_path = tmp_path / "state.json"
+    manager = DeploymentManager(state_path=str(state_path))
+    _register(manager, "project_1", sleeper)
+    manager.active_deployments["project_1"]["process_create_time"] = None
+    manager._save_state()
+
+    assert DeploymentManager(state_path=str(state_path)).active_deployments == {}
+
+
+@pytest.mark.parametrize("content", [
+    "{not json",
+    "[]",
+    '{"active_deployments": [], "project_types": {}}',
+    '{"active_deployments": {}, "project_types": {"/tmp/x": 5}}',
+])
+def test_malformed_state_file_is_ignored(tmp_path, content):
+    state_path = tmp_path / "state.json"
+    state_path.write_text(content)
+
+    manager = DeploymentManager(state_path=str(state_path))
+
+    assert manager.active_deployments == {}
+    assert manager._project_type_cache == {}
+
+
+# ── Project type cache ─────────────────────────────────────────────────────
+
+def test_type_cache_is_reused_while_layout_is_unchanged(tmp_path, monkeypatch):
+    (tmp_path / "package.json").write_text("{}")
+    manager = DeploymentManager()
+    assert manager._detect_project_type(tmp_path) == "nodejs"
+
+    monkeypatch.setattr(manager, "_scan_project_type", lambda path: pytest.fail("layout unchanged"))
+    assert manager._detect_project_type(tmp_path) == "nodejs"
+
+
+def test_type_cache_invalidates_when_package_json_changes(tmp_path):
+    package_json = tmp_path / "package.json"
+    package_json.write_text("{}")
+    manager = DeploymentManager()
+    assert manager._detect_project_type(tmp_path) == "nodejs"
+
+    _touch(package_json, '{"dependencies": {"react": "^18.0.0"}}')
+    assert manager._detect_project_type(tmp_path) == "react"
+
+
+def test_type_cache_invalidates_when_app_web_changes(tmp_path):
+    (tmp_path / "package.json").write_text("{}")
+    web_dir = tmp_path / "app" / "web"
+    web_dir.mkdir(parents=True)
+    manager = DeploymentManager()
+    assert manager._detect_project_type(tmp_path) == "nodejs"
+
+    # Adding an entry changes app/web's own mtime, not the project root's
+    (web_dir / "package.json").write_text("{}")
+    stat = web_dir.stat()
+    os.utime(web_dir, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert manager._detect_project_type(tmp_path) == "fullstack-app"
+
+
+# ── Install fingerprints ───────────────────────────────────────────────────
+
+def test_npm_install_is_skipped_until_its_inputs_change(tmp_path):
+    (tmp_path / "package.json").write_text("{}")
+    (tmp_path / "node_modules").mkdir()
+    bash_tool = RecordingBashTool()
+    manager = DeploymentManager(bash_tool=bash_tool)
+    config = {"install_command": "npm install"}
+
+    assert manager._install_and_build(tmp_path, config)["success"]
+    assert manager._install_and_build(tmp_path, config)["success"]
+    assert bash_tool.commands == ["npm install"]
+
+    _touch(tmp_path / "package.json", '{"dependencies": {"left-pad": "1.3.0"}}')
+    manager._install_and_build(tmp_path, config)
+    assert bash_tool.commands == ["npm install"] * 2
+
+
+def test_npm_install_reruns_when_node_modules_is_gone(tmp_path):
+    (tmp_path / "package.json").write_text("{}")
+    (tmp_path / "node_modules").mkdir()
+    bash_tool = RecordingBashTool()
+    manager = DeploymentManager(bash_tool=bash_tool)
+    config = {"install_command": "npm install"}
+
+    manager._install_and_build(tmp_path, config)
+    (tmp_path / "node_modules").rmdir()
+    manager._install_and_build(tmp_path, config)
+    assert bash_tool.commands == ["npm install"] * 2
+
+
+def test_pip_install_always_runs(tmp_path):
+    (tmp_path / "requirements.txt").write_text("flask\n")
+    bash_tool = RecordingBashTool()
+    manager = DeploymentManager(bash_tool=bash_tool)
+    config = {"install_command": "pip install -r requirements.txt"}
+
+    manager._install_and_build(tmp_path, config)
+    manager._install_and_build(tmp_path, config)
+    assert bash_tool.commands == ["pip install -r requirements.txt"] * 2
+
+
+# ── Batch deployment and history ───────────────────────────────────────────
+
+def test_deploy_projects_keeps_order_and_unique_ids(tmp_path):
+    paths = []
+    for parent in ("a", "b"):
+        project = tmp_path / parent / "web"
+        project.mkdir(parents=True)
+        (project / "index.html").write_text(f"<h1>{parent}</h1>")
+        paths.append(str(project))
+    missing = str(tmp_path / "missing")
+
+    manager = DeploymentManager()
+    try:
+        results = manager.deploy_projects([paths[0], missing, paths[1]])
+
+        assert [result["success"] for result in results] == [True, False, True]
+        assert "does not exist" in results[1]["error"]
+        deployment_ids = [results[0]["deployment_id"], results[2]["deployment_id"]]
+        assert len(set(deployment_ids)) == 2
+        assert set(manager.active_deployments) == set(deployment_ids)
+    finally:
+        process_ids = [deployment["process_id"] for deployment in manager.active_deployments.values()]
+        manager.stop_all_deployments()
+
+    assert not any(_is_process_group_alive(process_id) for process_id in process_ids)
+
+
+def test_get_history_returns_most_recent_entries_oldest_first():
+    manager = DeploymentManager()
+    for index in range(5):
+        manager.deployment_history.append({"deployment_id": f"d{index}", "timestamp_ns": index * 1_000_000_000})
+
+    history = manager.get_history(limit=2)
+
+    assert [entry["deployment_id"] for entry in history] == ["d3", "d4"]
+    assert all(entry["timestamp"] for entry in history)
+    assert len(manager.get_history()) == 5
+
+
+def test_deployment_history_is_bounded():
+    manager = DeploymentManager()
+    for index in range(_MAX_DEPLOYMENT_HISTORY + 10):
+        manager.deployment_history.append({"deployment_id": f"d{index}", "timestamp_ns": 0})
+
+    history = manager.get_history()
+    assert len(history) == _MAX_DEPLOYMENT_HISTORY
+    assert history[0]["deployment_id"] == "d10"